@@ -6,6 +6,12 @@ class ActionSerializerGenericAPIView(GenericAPIView):
     def get_action_serializer(self, method):
         assert hasattr(self, "action"), "View must have an `action` attribute"
 
+        # A view instance handles a single request, so resolve each action/method combination only once
+        cache = self.__dict__.setdefault("_action_serializer_cache", {})
+        cache_key = (self.action, method)
+        if cache_key in cache:
+            return cache[cache_key]
+
         candidates = [
             f"{self.action}_{method}_serializer_class",
             f"{method}_serializer_class",
@@ -29,6 +35,7 @@ class ActionSerializerGenericAPIView(GenericAPIView):
         for attr in candidates:
             result = getattr(self, attr, None)
             if result is not None:
+                cache[cache_key] = result
                 return result
 
         raise AssertionError(
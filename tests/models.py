@@ -1,5 +1,15 @@
 from django.db import models
 
 
+class Owner(models.Model):
+    name = models.CharField(max_length=100)
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100)
+
+
 class Thing(models.Model):
     name = models.CharField(max_length=100)
+    owner = models.ForeignKey(Owner, null=True, blank=True, on_delete=models.SET_NULL, related_name="things")
+    tags = models.ManyToManyField(Tag, blank=True, related_name="things")
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 INSTALLED_APPS = [
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -11,6 +13,8 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
+        # A file, so that pytest --reuse-db can keep the test database between runs
+        "TEST": {"NAME": str(Path(__file__).parent / "test_db.sqlite3")},
     }
 }
 
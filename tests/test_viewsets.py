@@ -1,12 +1,29 @@
+import hashlib
+import json
+from functools import partial
+
 import pytest
-from rest_framework import serializers, status
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models.functions import Upper
+from django.utils.functional import cached_property
+from rest_framework import permissions, serializers, status
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.relations import RelatedField
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory
 
 from drf_action_serializers.viewsets import ActionSerializerModelViewSet
-from tests.models import Thing
+from tests.models import Owner, Tag, Thing
+
+# Request bodies, encoded once at import instead of rendered on every request
+BODIES = {
+    name: json.dumps({"name": name}).encode() for name in ["new", "patched", "valid name", "new valid name", "test"]
+}
 
 
 class WriteSerializer(serializers.ModelSerializer):
@@ -16,14 +33,16 @@ class WriteSerializer(serializers.ModelSerializer):
 
 
 class RetrieveSerializer(serializers.ModelSerializer):
-    extra = serializers.SerializerMethodField()
+    # Filled in by to_representation
+    extra = serializers.CharField(read_only=True)
 
     class Meta:
         model = Thing
         fields = ["id", "name", "extra"]
 
-    def get_extra(self, obj):
-        return "extra value"
+    def to_representation(self, instance):
+        # Build the output directly instead of going through the per-field loop
+        return {"id": instance.id, "name": instance.name, "extra": "extra value"}
 
 
 class ListSerializer(serializers.ModelSerializer):
@@ -33,26 +52,151 @@ class ListSerializer(serializers.ModelSerializer):
         model = Thing
         fields = ["id", "name"]
 
+    def to_representation(self, instance):
+        return {"id": instance.id, "name": instance.name}
+
 
 class ThingCustomActionSerializer(serializers.ModelSerializer):
     """Serializer for custom action"""
 
-    name_uppercase = serializers.SerializerMethodField()
+    # Annotated on the queryset by the viewset
+    name_uppercase = serializers.CharField(read_only=True)
 
     class Meta:
         model = Thing
         fields = ["id", "name", "name_uppercase"]
 
-    def get_name_uppercase(self, obj):
-        return obj.name.upper()
-
 
 class TestPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
 
 
-class BasicViewSet(ActionSerializerModelViewSet):
+def count_cache_key(queryset):
+    """Cache key for the count of the queryset, or None if it can't match any rows"""
+    try:
+        sql = str(queryset.query)
+    except EmptyResultSet:
+        return None
+    return f"paginator-count:{hashlib.md5(sql.encode(), usedforsecurity=False).hexdigest()}"
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches the total count of its query under the given key"""
+
+    def __init__(self, *args, count_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self.object_list.count()
+        return cache.get_or_set(self.count_key, self.object_list.count, 300)
+
+
+class CachedCountPagination(TestPagination):
+    """Pagination that reuses the cached count while walking pages, recomputing it on the first page"""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        key = count_cache_key(queryset)
+        if key is not None and request.query_params.get(self.page_query_param, "1") == "1":
+            cache.delete(key)
+
+        # Hand the key to the paginator so the query is only compiled once per request
+        self.django_paginator_class = partial(CachedCountPaginator, count_key=key)
+        return super().paginate_queryset(queryset, request, view)
+
+
+def source_model_fields(model, source_attrs):
+    """Model fields along a serializer field's source, up to the first attribute that isn't a model field"""
+    fields = []
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+
+        fields.append(field)
+        if not field.is_relation:
+            break
+        model = field.related_model
+    return fields
+
+
+class SerializerRelationsMixin:
+    """Select or prefetch the relations read by the resolved serializer to avoid N+1 queries"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related = []
+        prefetch_related = []
+
+        for field in self.get_serializer().fields.values():
+            if field.write_only:
+                continue
+
+            model_fields = source_model_fields(queryset.model, field.source_attrs)
+            relations = [f for f in model_fields if f.is_relation]
+            if (
+                isinstance(field, RelatedField)
+                and field.use_pk_only_optimization()
+                and len(model_fields) == len(field.source_attrs)
+                and relations[-1:] == model_fields[-1:]
+            ):
+                # The related pk is read from the foreign key column, no need to join the related row
+                relations = relations[:-1]
+            if not relations:
+                continue
+
+            lookup = "__".join(f.name for f in relations)
+            if any(f.many_to_many or f.one_to_many for f in relations):
+                prefetch_related.append(lookup)
+            else:
+                select_related.append(lookup)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+def concrete_field_names(serializer, annotations=()):
+    """Lookups for the model columns read by the bound serializer's fields, or None if a field reads anything else"""
+    model = serializer.Meta.model
+    names = [model._meta.pk.name]
+
+    for field in serializer.fields.values():
+        if field.write_only or (len(field.source_attrs) == 1 and field.source_attrs[0] in annotations):
+            continue
+
+        model_fields = source_model_fields(model, field.source_attrs)
+        if not field.source_attrs or len(model_fields) < len(field.source_attrs):
+            # Method fields and properties may read any column, deferring one would cost a query per row
+            return None
+
+        path = []
+        for model_field in model_fields:
+            if not model_field.concrete or model_field.many_to_many:
+                break
+            path.append(model_field.name)
+
+        lookup = "__".join(path)
+        if lookup and lookup not in names:
+            names.append(lookup)
+    return names
+
+
+def only_serializer_columns(queryset, serializer):
+    """Restrict the queryset to the columns the serializer reads, when they can all be determined"""
+    names = concrete_field_names(serializer, queryset.query.annotations)
+    if names is None:
+        return queryset
+    return queryset.only(*names)
+
+
+class BasicViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
     """ViewSet using different serializers for write and read methods"""
 
     write_serializer_class = WriteSerializer
@@ -60,7 +204,7 @@ class BasicViewSet(ActionSerializerModelViewSet):
     queryset = Thing.objects.all()
 
 
-class AdvancedViewSet(ActionSerializerModelViewSet):
+class AdvancedViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
     """ViewSet using different serializers for list and retrieve actions"""
 
     queryset = Thing.objects.all().order_by("id")
@@ -69,7 +213,7 @@ class AdvancedViewSet(ActionSerializerModelViewSet):
     write_serializer_class = WriteSerializer
     create_read_serializer_class = ListSerializer
     update_read_serializer_class = RetrieveSerializer
-    pagination_class = TestPagination
+    pagination_class = CachedCountPagination
 
     @action(detail=True, methods=["get"])
     def uppercase(self, request, pk=None):
@@ -77,13 +221,22 @@ class AdvancedViewSet(ActionSerializerModelViewSet):
         serializer = self.get_serializer(thing)
         return Response(serializer.data)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "uppercase":
+            queryset = queryset.annotate(name_uppercase=Upper("name"))
+        if self.request.method in permissions.SAFE_METHODS:
+            # Only load the columns the response serializer reads
+            queryset = only_serializer_columns(queryset, self.get_serializer())
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "uppercase":
             return ThingCustomActionSerializer
         return super().get_serializer_class()
 
 
-class FallbackViewSet(ActionSerializerModelViewSet):
+class FallbackViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
     """ViewSet to test all serializer fallback paths"""
 
     queryset = Thing.objects.all()
@@ -99,43 +252,43 @@ class NoSerializerViewSet(ActionSerializerModelViewSet):
     # No serializer_class or any action-specific serializers
 
 
-# Fixtures
-@pytest.fixture
-def basic_viewset():
-    return BasicViewSet.as_view({"post": "create", "patch": "partial_update"})
-
+# Views are stateless, so they are built once at import time
+BASIC_VIEW = BasicViewSet.as_view({"post": "create", "patch": "partial_update"})
+ADVANCED_VIEW = AdvancedViewSet.as_view({"get": "list", "post": "create"})
+ADVANCED_DETAIL_VIEW = AdvancedViewSet.as_view({"get": "retrieve", "patch": "partial_update"})
+CUSTOM_ACTION_VIEW = AdvancedViewSet.as_view({"get": "uppercase"})
+FALLBACK_VIEW = FallbackViewSet.as_view({"get": "list", "post": "create", "patch": "partial_update"})
 
-@pytest.fixture
-def advanced_viewset():
-    return AdvancedViewSet.as_view({"get": "list", "post": "create"})
-
-
-@pytest.fixture
-def advanced_detail_viewset():
-    return AdvancedViewSet.as_view({"get": "retrieve", "patch": "partial_update"})
 
+# Fixtures
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
 
-@pytest.fixture
-def custom_action_viewset():
-    return AdvancedViewSet.as_view({"get": "uppercase"})
 
+@pytest.fixture(scope="session")
+def factory():
+    return APIRequestFactory()
 
-@pytest.fixture
-def fallback_viewset():
-    return FallbackViewSet.as_view({"get": "list", "post": "create", "patch": "partial_update"})
 
+def insert_thing(name):
+    """Insert a Thing row without the ORM, for tests that only need it to exist"""
+    table = connection.ops.quote_name(Thing._meta.db_table)
+    with connection.cursor() as cursor:
+        # RETURNING needs SQLite 3.35+, older builds only report the id through lastrowid
+        if connection.features.can_return_columns_from_insert:
+            cursor.execute(f"INSERT INTO {table} (name) VALUES (%s) RETURNING id", [name])
+            return cursor.fetchone()[0]
 
-@pytest.fixture
-def no_serializer_viewset():
-    return NoSerializerViewSet.as_view({"get": "list", "post": "create"})
+        cursor.execute(f"INSERT INTO {table} (name) VALUES (%s)", [name])
+        return cursor.lastrowid
 
 
 # Basic read/write tests
 @pytest.mark.django_db
-def test_create_uses_read_serializer(basic_viewset):
-    factory = APIRequestFactory()
-    request = factory.post("/", {"name": "new"}, format="json")
-    response = basic_viewset(request)
+def test_create_uses_read_serializer(factory):
+    request = factory.post("/", BODIES["new"], content_type="application/json")
+    response = BASIC_VIEW(request)
 
     assert response.status_code == status.HTTP_201_CREATED
     assert response.data["name"] == "new"
@@ -143,12 +296,11 @@ def test_create_uses_read_serializer(basic_viewset):
 
 
 @pytest.mark.django_db
-def test_partial_update_uses_read_serializer(basic_viewset):
-    thing = Thing.objects.create(name="existing")
+def test_partial_update_uses_read_serializer(factory):
+    pk = insert_thing("existing")
 
-    factory = APIRequestFactory()
-    request = factory.patch("/", {"name": "patched"}, format="json")
-    response = basic_viewset(request, pk=thing.pk)
+    request = factory.patch("/", BODIES["patched"], content_type="application/json")
+    response = BASIC_VIEW(request, pk=pk)
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data["name"] == "patched"
@@ -157,179 +309,312 @@ def test_partial_update_uses_read_serializer(basic_viewset):
 
 # Advanced action-specific tests
 @pytest.mark.django_db
-def test_list_action_uses_list_serializer(advanced_viewset):
-    # Create some test data
-    Thing.objects.create(name="short")
-    Thing.objects.create(name="very long name")
+class TestAdvanced:
+    @pytest.fixture(scope="class", autouse=True)
+    def things(self, django_db_setup, django_db_blocker):
+        """Things seeded once for the class in a transaction that is rolled back after its last test"""
+        with django_db_blocker.unblock(), transaction.atomic():
+            Thing.objects.bulk_create([Thing(name=f"item {i}") for i in range(15)])
+            # Re-fetch, as bulk_create only sets primary keys on backends that return them (SQLite 3.35+)
+            yield list(Thing.objects.order_by("id"))
+            transaction.set_rollback(True)
+
+    def test_list_action_uses_list_serializer(self, rf, django_assert_num_queries):
+        request = rf.get("/")
+        with django_assert_num_queries(1):
+            response = ADVANCED_VIEW(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 15
+
+        # Verify list serializer fields
+        first_item = response.data[0]
+        assert "id" in first_item
+        assert "name" in first_item
+        assert "extra" not in first_item
+
+    def test_retrieve_action_uses_detail_serializer(self, rf, things, django_assert_num_queries):
+        thing = things[0]
+
+        request = rf.get("/")
+        with django_assert_num_queries(1):
+            response = ADVANCED_DETAIL_VIEW(request, pk=thing.pk)
+
+        assert response.status_code == status.HTTP_200_OK
+
+        # Verify detail serializer fields
+        assert response.data["id"] == thing.id
+        assert response.data["name"] == thing.name
+        assert response.data["extra"] == "extra value"
+
+    def test_create_uses_write_serializer(self, factory):
+        # Test valid creation
+        request = factory.post("/", BODIES["valid name"], content_type="application/json")
+        response = ADVANCED_VIEW(request)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["name"] == "valid name"
+
+    def test_update_uses_write_serializer(self, factory):
+        pk = insert_thing("original name")
+
+        # Test valid update
+        request = factory.patch("/", BODIES["new valid name"], content_type="application/json")
+        response = ADVANCED_DETAIL_VIEW(request, pk=pk)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == "new valid name"
+
+    def test_custom_action_uses_custom_serializer(self, rf, things, django_assert_num_queries):
+        thing = things[0]
+
+        request = rf.get("/")
+        with django_assert_num_queries(1):
+            response = CUSTOM_ACTION_VIEW(request, pk=thing.pk)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == thing.name
+        assert response.data["name_uppercase"] == thing.name.upper()
+
+    def test_list_pagination(self, rf, django_assert_num_queries):
+        # The first page counts and selects
+        request = rf.get("/?page_size=5")
+        with django_assert_num_queries(2):
+            response = ADVANCED_VIEW(request)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 15
+
+        # Walking to the next page reuses the cached count
+        request = rf.get("/?page=2&page_size=5")
+        with django_assert_num_queries(1):
+            response = ADVANCED_VIEW(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 5
+        assert response.data["count"] == 15
+        assert "next" in response.data
+        assert "previous" in response.data
+
+    def test_list_pagination_empty_result(self, rf, django_assert_num_queries):
+        # A filter that can never match has no SQL to key the cached count on
+        pagination = CachedCountPagination()
+        request = Request(rf.get("/?page_size=5"))
+        with django_assert_num_queries(0):
+            page = pagination.paginate_queryset(Thing.objects.filter(pk__in=[]).order_by("id"), request)
+
+        assert page == []
+        assert pagination.page.paginator.count == 0
 
-    factory = APIRequestFactory()
-    request = factory.get("/")
-    response = advanced_viewset(request)
 
-    assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 2
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "method,body,expected_status,expected_fields,expected_queries",
+    [
+        # Create action with action-specific read serializer (ListSerializer)
+        ("POST", BODIES["new"], status.HTTP_201_CREATED, {"id", "name"}, 1),
+        # Partial update action with update-specific read serializer (RetrieveSerializer)
+        ("PATCH", BODIES["patched"], status.HTTP_200_OK, {"id", "name", "extra"}, 2),
+        # List action with method fallback (read_serializer_class, RetrieveSerializer)
+        ("GET", b"", status.HTTP_200_OK, {"id", "name", "extra"}, 1),
+    ],
+    ids=["create", "partial_update", "list"],
+)
+def test_serializer_fallback_paths(
+    factory, django_assert_num_queries, method, body, expected_status, expected_fields, expected_queries
+):
+    # PATCH updates this row and GET lists it
+    pk = insert_thing("existing")
+    kwargs = {"pk": pk} if method == "PATCH" else {}
+    request = factory.generic(method, "/", body, content_type="application/json")
+    with django_assert_num_queries(expected_queries):
+        response = FALLBACK_VIEW(request, **kwargs)
+
+    assert response.status_code == expected_status
+    data = response.data[0] if method == "GET" else response.data
+    assert set(data) == expected_fields
+    if body:
+        assert data["name"] == json.loads(body)["name"]
+
+
+class MinimalViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
+    """ViewSet with minimal serializer configuration"""
 
-    # Verify list serializer fields
-    first_item = response.data[0]
-    assert "id" in first_item
-    assert "name" in first_item
-    assert "extra" not in first_item
+    queryset = Thing.objects.all()
+    serializer_class = WriteSerializer  # Only final fallback
+
+
+MINIMAL_VIEW = MinimalViewSet.as_view({"get": "list", "post": "create", "patch": "partial_update"})
 
 
 @pytest.mark.django_db
-def test_retrieve_action_uses_detail_serializer(advanced_detail_viewset):
-    # Create test data
-    thing = Thing.objects.create(name="very long name")
+@pytest.mark.parametrize(
+    "method,body,expected_status,expected_queries",
+    [
+        ("POST", BODIES["new"], status.HTTP_201_CREATED, 1),
+        ("PATCH", BODIES["patched"], status.HTTP_200_OK, 2),
+        ("GET", b"", status.HTTP_200_OK, 1),
+    ],
+    ids=["create", "partial_update", "list"],
+)
+def test_minimal_serializer_configuration(
+    factory, django_assert_num_queries, method, body, expected_status, expected_queries
+):
+    # Test that all actions fall back to serializer_class
+    # PATCH updates this row and GET lists it
+    pk = insert_thing("existing")
+    kwargs = {"pk": pk} if method == "PATCH" else {}
+    request = factory.generic(method, "/", body, content_type="application/json")
+    with django_assert_num_queries(expected_queries):
+        response = MINIMAL_VIEW(request, **kwargs)
 
-    factory = APIRequestFactory()
-    request = factory.get("/")
-    response = advanced_detail_viewset(request, pk=thing.pk)
+    assert response.status_code == expected_status
+    data = response.data[0] if method == "GET" else response.data
+    assert set(data) == {"id", "name"}
+    if body:
+        assert data["name"] == json.loads(body)["name"]
 
-    assert response.status_code == status.HTTP_200_OK
 
-    # Verify detail serializer fields
-    assert response.data["id"] == thing.id
-    assert response.data["name"] == "very long name"
-    assert response.data["extra"] == "extra value"
+class ThingRelationsSerializer(serializers.ModelSerializer):
+    owner_name = serializers.CharField(source="owner.name", read_only=True)
+    tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field="name")
 
+    class Meta:
+        model = Thing
+        fields = ["id", "name", "owner_name", "tags"]
 
-@pytest.mark.django_db
-def test_create_uses_write_serializer(advanced_viewset):
-    factory = APIRequestFactory()
 
-    # Test valid creation
-    request = factory.post("/", {"name": "valid name"}, format="json")
-    response = advanced_viewset(request)
-    assert response.status_code == status.HTTP_201_CREATED
-    assert response.data["name"] == "valid name"
+class RelationsViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
+    """ViewSet whose serializer reads a foreign key and a many-to-many relation"""
+
+    queryset = Thing.objects.all().order_by("id")
+    serializer_class = ThingRelationsSerializer
+
+
+RELATIONS_VIEW = RelationsViewSet.as_view({"get": "list"})
 
 
 @pytest.mark.django_db
-def test_update_uses_write_serializer(advanced_detail_viewset):
-    thing = Thing.objects.create(name="original name")
-    factory = APIRequestFactory()
+def test_relations_are_selected_and_prefetched(rf, django_assert_num_queries):
+    Tag.objects.bulk_create([Tag(name="a"), Tag(name="b")])
+    # Re-fetch, as bulk_create only sets primary keys on backends that return them (SQLite 3.35+)
+    tags = list(Tag.objects.all())
+    for i in range(3):
+        thing = Thing.objects.create(name=f"thing {i}", owner=Owner.objects.create(name=f"owner {i}"))
+        thing.tags.set(tags)
+
+    # One query for the things joined with their owners, one for the prefetched tags
+    with django_assert_num_queries(2):
+        response = RELATIONS_VIEW(rf.get("/"))
 
-    # Test valid update
-    request = factory.patch("/", {"name": "new valid name"}, format="json")
-    response = advanced_detail_viewset(request, pk=thing.pk)
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["name"] == "new valid name"
+    assert [item["owner_name"] for item in response.data] == ["owner 0", "owner 1", "owner 2"]
+    assert all(sorted(item["tags"]) == ["a", "b"] for item in response.data)
 
 
-@pytest.mark.django_db
-def test_custom_action_uses_custom_serializer(custom_action_viewset):
-    thing = Thing.objects.create(name="test name")
-    factory = APIRequestFactory()
+class ThingSourcesSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source="name", read_only=True)
+    owner_name = serializers.CharField(source="owner.name", read_only=True)
 
-    request = factory.get("/")
-    response = custom_action_viewset(request, pk=thing.pk)
+    class Meta:
+        model = Thing
+        fields = ["id", "title", "owner_name"]
 
-    assert response.status_code == status.HTTP_200_OK
-    assert response.data["name"] == "test name"
-    assert response.data["name_uppercase"] == "TEST NAME"
+
+class ThingOwnerIdSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Thing
+        fields = ["id", "name", "owner"]
+
+
+class OwnerIdViewSet(SerializerRelationsMixin, ActionSerializerModelViewSet):
+    """ViewSet whose serializer only reads the primary key of a foreign key"""
+
+    queryset = Thing.objects.all().order_by("id")
+    serializer_class = ThingOwnerIdSerializer
+
+
+OWNER_ID_VIEW = OwnerIdViewSet.as_view({"get": "list"})
 
 
 @pytest.mark.django_db
-def test_list_pagination(advanced_viewset):
-    # Create multiple items
-    for i in range(15):
-        Thing.objects.create(name=f"item {i}")
+def test_primary_key_relations_are_not_joined(rf, django_assert_num_queries):
+    owner = Owner.objects.create(name="owner")
+    Thing.objects.create(name="thing", owner=owner)
 
-    factory = APIRequestFactory()
-    request = factory.get("/?page=2&page_size=5")
-    response = advanced_viewset(request)
+    with django_assert_num_queries(1) as captured:
+        response = OWNER_ID_VIEW(rf.get("/"))
 
-    assert response.status_code == status.HTTP_200_OK
-    assert len(response.data["results"]) == 5
-    assert "count" in response.data
-    assert "next" in response.data
-    assert "previous" in response.data
+    assert "JOIN" not in captured.captured_queries[0]["sql"]
+    assert response.data[0]["owner"] == owner.pk
 
 
 @pytest.mark.django_db
-def test_serializer_fallback_paths(fallback_viewset):
-    factory = APIRequestFactory()
+def test_only_keeps_columns_read_through_sources(django_assert_num_queries):
+    serializer = ThingSourcesSerializer()
+    assert concrete_field_names(serializer) == ["id", "name", "owner__name"]
 
-    # Test create action with action-specific read serializer
-    request = factory.post("/", {"name": "new"}, format="json")
-    response = fallback_viewset(request)
-    assert response.status_code == status.HTTP_201_CREATED
-    assert "id" in response.data
-    assert "name" in response.data
-    assert "extra" not in response.data  # ListSerializer doesn't have extra field
-
-    # Test partial_update action with update-specific read serializer
-    thing = Thing.objects.create(name="existing")
-    request = factory.patch("/", {"name": "patched"}, format="json")
-    response = fallback_viewset(request, pk=thing.pk)
-    assert response.status_code == status.HTTP_200_OK
-    assert response.data["name"] == "patched"
-    assert response.data["extra"] == "extra value"  # RetrieveSerializer has extra field
+    Thing.objects.create(name="thing", owner=Owner.objects.create(name="owner"))
+    queryset = Thing.objects.select_related("owner").only(*concrete_field_names(serializer))
 
-    # Test list action with method fallback
-    request = factory.get("/")
-    response = fallback_viewset(request)
-    assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) > 0
-    assert "id" in response.data[0]
-    assert "name" in response.data[0]
-    assert "extra" in response.data[0]  # read_serializer_class (RetrieveSerializer) is used
+    # Reading a deferred column would cost an extra query per row
+    with django_assert_num_queries(1):
+        data = ThingSourcesSerializer(queryset, many=True).data
 
+    assert data[0]["title"] == "thing"
+    assert data[0]["owner_name"] == "owner"
 
-class MinimalViewSet(ActionSerializerModelViewSet):
-    """ViewSet with minimal serializer configuration"""
 
-    queryset = Thing.objects.all()
-    serializer_class = WriteSerializer  # Only final fallback
+class ThingMethodSerializer(serializers.ModelSerializer):
+    upper = serializers.SerializerMethodField()
 
+    class Meta:
+        model = Thing
+        fields = ["id", "upper"]
 
-@pytest.fixture
-def minimal_viewset():
-    return MinimalViewSet.as_view({"get": "list", "post": "create", "patch": "partial_update"})
+    def get_upper(self, obj):
+        return obj.name.upper()
 
 
 @pytest.mark.django_db
-def test_minimal_serializer_configuration(minimal_viewset):
-    factory = APIRequestFactory()
+def test_only_is_skipped_for_method_fields(django_assert_num_queries):
+    Thing.objects.bulk_create([Thing(name=f"thing {i}") for i in range(3)])
+    queryset = only_serializer_columns(Thing.objects.order_by("id"), ThingMethodSerializer())
 
-    # Test that all actions fall back to serializer_class
-    # Create
-    request = factory.post("/", {"name": "new"}, format="json")
-    response = minimal_viewset(request)
-    assert response.status_code == status.HTTP_201_CREATED
-    assert "id" in response.data
-    assert "name" in response.data
-    assert "extra" not in response.data
-
-    # Update
-    thing = Thing.objects.create(name="existing")
-    request = factory.patch("/", {"name": "patched"}, format="json")
-    response = minimal_viewset(request, pk=thing.pk)
-    assert response.status_code == status.HTTP_200_OK
-    assert response.data["name"] == "patched"
-    assert "extra" not in response.data
+    # get_upper reads name, which must not be deferred
+    with django_assert_num_queries(1):
+        data = ThingMethodSerializer(queryset, many=True).data
 
-    # List
-    request = factory.get("/")
-    response = minimal_viewset(request)
-    assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) > 0
-    assert "id" in response.data[0]
-    assert "name" in response.data[0]
-    assert "extra" not in response.data[0]
+    assert [item["upper"] for item in data] == ["THING 0", "THING 1", "THING 2"]
 
 
-@pytest.mark.django_db
-def test_error_when_no_serializer_found(no_serializer_viewset):
-    factory = APIRequestFactory()
+def test_error_when_no_serializer_found(factory):
+    # Resolve the serializer on a view instance directly, without the request dispatch
     # Test GET (list)
-    request = factory.get("/")
+    view = NoSerializerViewSet(action="list", request=factory.get("/"))
     with pytest.raises(AssertionError) as excinfo:
-        no_serializer_viewset(request)
+        view.get_serializer_class()
     assert "must define a suitable serializer" in str(excinfo.value)
 
     # Test POST (create)
-    request = factory.post("/", {"name": "test"}, format="json")
+    request = factory.post("/", BODIES["test"], content_type="application/json")
+    view = NoSerializerViewSet(action="create", request=request)
     with pytest.raises(AssertionError) as excinfo:
-        no_serializer_viewset(request)
+        view.get_serializer_class()
     assert "must define a suitable serializer" in str(excinfo.value)
+
+
+def test_action_serializer_is_resolved_once_per_action(factory):
+    lookups = []
+
+    class CountingViewSet(AdvancedViewSet):
+        @property
+        def list_serializer_class(self):
+            lookups.append(self.action)
+            return ListSerializer
+
+    view = CountingViewSet(action="list", request=factory.get("/"))
+    assert view.get_serializer_class() is ListSerializer
+    assert view.get_serializer_class() is ListSerializer
+    assert lookups == ["list"]
+
+    # Other actions are resolved separately
+    view.action = "retrieve"
+    assert view.get_serializer_class() is RetrieveSerializer